@@ -2,9 +2,9 @@
 import copy
 import logging
 from functools import partial
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
-from opensfm import exif
+from opensfm import context, exif
 from opensfm.dataset_base import DataSetBase
 
 
@@ -19,19 +19,35 @@ def run_dataset(data: DataSetBase) -> None:
     if data.exif_overrides_exists():
         exif_overrides = data.load_exif_overrides()
 
+    # EXIF parsing is pure Python and holds the GIL, so it runs in separate
+    # processes. Batch sizes are not capped, leaving parallel_map's default
+    # of about two batches per process, so the dataset is pickled per batch
+    # rather than per image. Workers save each image's EXIF as soon as it is
+    # done. Their logging is not configured, so progress is logged here.
+    images_to_extract = [i for i in data.images() if not data.exif_exists(i)]
+    logging.info("Extracting EXIF for {} images".format(len(images_to_extract)))
+    args = [(image, data, exif_overrides.get(image)) for image in images_to_extract]
+    extracted = dict(
+        zip(
+            images_to_extract,
+            context.parallel_map(
+                _extract_exif_unwrap_args,
+                args,
+                data.config["processes"],
+                max_batch_size=0,
+                backend="loky",
+            ),
+        )
+    )
+
     camera_models = {}
     for image in data.images():
-        if data.exif_exists(image):
+        if image not in extracted:
             logging.info("Loading existing EXIF for {}".format(image))
             d = data.load_exif(image)
         else:
-            logging.info("Extracting EXIF for {}".format(image))
-            d = _extract_exif(image, data)
-
-            if image in exif_overrides:
-                d.update(exif_overrides[image])
-
-            data.save_exif(image, d)
+            logging.info("Extracted EXIF for {}".format(image))
+            d = extracted[image]
 
         if d["camera"] not in camera_models:
             camera = exif.camera_from_exif_metadata(d, data)
@@ -50,6 +66,19 @@ def run_dataset(data: DataSetBase) -> None:
     data.save_camera_models(camera_models)
 
 
+def _extract_exif_unwrap_args(
+    args: Tuple[str, DataSetBase, Optional[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    image, data, overrides = args
+    d = _extract_exif(image, data)
+
+    if overrides is not None:
+        d.update(overrides)
+
+    data.save_exif(image, d)
+    return d
+
+
 def _extract_exif(image: str, data: DataSetBase) -> Dict[str, Any]:
     with data.open_image_file(image) as fp:
         d = exif.extract_exif_from_file(
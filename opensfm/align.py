@@ -74,6 +74,20 @@ def apply_similarity(
         apply_similarity_pose(rig_camera.pose, s, np.eye(3), np.array([0, 0, 0]))
 
 
+def apply_translation(reconstruction: types.Reconstruction, b: NDArray) -> None:
+    """Apply a translation (y = x + b) to a reconstruction.
+
+    Same as apply_similarity with s = 1 and A = I, without the rotation
+    products. Rig cameras are left untouched since they are not scaled.
+    """
+    for point in reconstruction.points.values():
+        point.coordinates = point.coordinates + b
+
+    for rig_instance in reconstruction.rig_instances.values():
+        pose = rig_instance.pose
+        pose.set_origin(pose.get_origin() + b)
+
+
 def compute_reconstruction_similarity(
     reconstruction: types.Reconstruction,
     gcp: List[pymap.GroundControlPoint],
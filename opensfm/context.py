@@ -45,9 +45,18 @@ R = TypeVar("R")
 
 
 def parallel_map(
-    func: Callable[[T], R], args: List[T], num_proc: int, max_batch_size: int = 1
+    func: Callable[[T], R],
+    args: List[T],
+    num_proc: int,
+    max_batch_size: int = 1,
+    backend: str = "threading",
 ) -> List[R]:
-    """Run function for all arguments using multiple processes."""
+    """Run function for all arguments using multiple processes.
+
+    The default threading backend suits functions releasing the GIL
+    (OpenCV, native extensions). Pure Python functions need a process
+    backend such as "loky", in which case func and args must be picklable.
+    """
     # De-activate/Restore any inner OpenCV threading
     threads_used = cv2.getNumThreads()
     cv2.setNumThreads(0)
@@ -56,7 +65,7 @@ def parallel_map(
     if num_proc <= 1:
         res = list(map(func, args))
     else:
-        with parallel_backend("threading", n_jobs=num_proc):
+        with parallel_backend(backend, n_jobs=num_proc):
             batch_size = max(1, int(len(args) / (num_proc * 2)))
             batch_size = (
                 min(batch_size, max_batch_size) if max_batch_size else batch_size
@@ -2,24 +2,72 @@
 
 import datetime
 import logging
-from codecs import decode, encode
+import re
+from functools import lru_cache
+from io import BytesIO
 from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
 
 import exifread
 import numpy as np
-import xmltodict as x2d
 from opensfm import pygeometry
 
 from opensfm.dataset_base import DataSetBase
-from opensfm.geo import ecef_from_lla
 from opensfm.sensors import camera_calibration, sensor_data
 
 logger: logging.Logger = logging.getLogger(__name__)
 inch_in_mm: float = 25.4
 cm_in_mm: float = 10
 um_in_mm: float = 0.001
+mm_per_resolution_unit: Dict[int, float] = {
+    2: inch_in_mm,  # inch
+    3: cm_in_mm,  # cm
+    4: 1.0,  # mm
+    5: um_in_mm,  # um
+}
 default_projection: str = "perspective"
 maximum_altitude: float = 1e4
+unix_epoch: datetime.datetime = datetime.datetime(1970, 1, 1)
+exif_header_size: int = 256 * 1024
+# Last tag, in IFD order, read from the EXIF sub-IFD. exifread stops
+# walking an IFD once it has decoded this tag.
+exif_stop_tag: str = "LensModel"
+xmp_read_chunk_size: int = 128 * 1024
+xmp_read_max_size: int = 2 * 1024 * 1024
+xmp_start_marker: bytes = b"<x:xmpmeta"
+xmp_packet_re: "re.Pattern[bytes]" = re.compile(
+    rb"<x:xmpmeta.*?</x:xmpmeta>", re.DOTALL
+)
+# XMP properties read by EXIF, either as attributes or as simple elements
+xmp_fields: Tuple[str, ...] = (
+    "GPano:ProjectionType",
+    "Camera:Yaw",
+    "Camera:Pitch",
+    "Camera:Roll",
+    "drone-dji:Latitude",
+    "drone-dji:Longitude",
+    "drone-dji:AbsoluteAltitude",
+    "drone-dji:GimbalYawDegree",
+    "drone-dji:GimbalPitchDegree",
+    "drone-dji:GimbalRollDegree",
+)
+_xmp_field_names: bytes = b"|".join(re.escape(f.encode()) for f in xmp_fields)
+xmp_fields_re: "re.Pattern[bytes]" = re.compile(
+    rb"\s("
+    + _xmp_field_names
+    + rb""")\s*=\s*(?:"([^"]*)"|'([^']*)')|<("""
+    + _xmp_field_names
+    + rb")>([^<]*)</"
+)
+xml_entity_re: "re.Pattern[str]" = re.compile(
+    r"&(?:#x([0-9a-fA-F]+)|#([0-9]+)|(amp|lt|gt|quot|apos));"
+)
+xml_entities: Dict[str, str] = {
+    "amp": "&",
+    "lt": "<",
+    "gt": ">",
+    "quot": '"',
+    "apos": "'",
+}
 
 
 def eval_frac(
@@ -82,11 +130,23 @@ def compute_focal(
     return focal_35, focal_ratio
 
 
-def sensor_string(make: str, model: str) -> str:
+@lru_cache(maxsize=256)
+def _normalize_make_model(make: str, model: str) -> Tuple[str, str]:
+    """Strip make/model and remove the duplicated 'make' from 'model'.
+
+    Results are cached for the few cameras most datasets have. The cache
+    is bounded since models can be unique per image, e.g. with
+    unknown_camera_models_are_different.
+    """
     if make != "unknown":
         # remove duplicate 'make' information in 'model'
         model = model.replace(make, "")
-    return (make.strip() + " " + model.strip()).strip().lower()
+    return make.strip(), model.strip()
+
+
+def sensor_string(make: str, model: str) -> str:
+    make, model = _normalize_make_model(make, model)
+    return (make + " " + model).strip().lower()
 
 
 def camera_id(exif: Dict[str, Any]) -> str:
@@ -103,19 +163,12 @@ def camera_id(exif: Dict[str, Any]) -> str:
 def camera_id_(
     make: str, model: str, width: int, height: int, projection_type: str, focal: float
 ) -> str:
-    if make != "unknown":
-        # remove duplicate 'make' information in 'model'
-        model = model.replace(make, "")
-    return " ".join(
-        [
-            "v2",
-            make.strip(),
-            model.strip(),
-            str(int(width)),
-            str(int(height)),
-            projection_type,
-            str(float(focal))[:6],
-        ]
+    make, model = _normalize_make_model(make, model)
+    # Camera ids are stored in datasets, keep the historical
+    # truncated repr rather than a rounded format like ".4g"
+    focal_str = str(float(focal))[:6]
+    return (
+        f"v2 {make} {model} {int(width)} {int(height)} {projection_type} {focal_str}"
     ).lower()
 
 
@@ -130,47 +183,115 @@ def extract_exif_from_file(
     return d
 
 
-def unescape_string(s: str) -> str:
-    return decode(encode(s, "latin-1", "backslashreplace"), "unicode-escape")
+def get_xmp_packet(
+    fileobj: Union[bytes, BinaryIO], head: bytes = b""
+) -> Optional[bytes]:
+    """Find the raw XMP packet in an image fileobj or header bytes
 
-
-def parse_xmp_string(xmp_str: str) -> Optional[Dict[str, Any]]:
-    for _ in range(2):
-        try:
-            return x2d.parse(xmp_str)
-        except Exception:
-            xmp_str = unescape_string(xmp_str)
+    Bytes are searched entirely. Files are searched in their header, i.e.
+    the `head` bytes already read from them or else their first
+    exif_header_size bytes. More chunks are read only to complete a packet
+    (or a start marker) beginning in what has been read, up to
+    xmp_read_max_size bytes.
+    """
+    if isinstance(fileobj, bytes):
+        match = xmp_packet_re.search(fileobj)
+        return match.group(0) if match is not None else None
+
+    buf = head or fileobj.read(exif_header_size)
+    start = buf.find(xmp_start_marker)
+    while start >= 0 or _ends_with_partial_marker(buf):
+        if start >= 0:
+            match = xmp_packet_re.search(buf, start)
+            if match is not None:
+                return match.group(0)
+        if len(buf) >= xmp_read_max_size:
+            return None
+        chunk = fileobj.read(xmp_read_chunk_size)
+        if not chunk:
+            return None
+        scanned = len(buf)
+        buf += chunk
+        if start < 0:
+            # The marker straddles the previous end of the buffer
+            start = buf.find(xmp_start_marker, max(0, scanned - len(xmp_start_marker)))
     return None
 
 
-def get_xmp(fileobj: BinaryIO) -> List[Dict[str, Any]]:
-    """Extracts XMP metadata from and image fileobj"""
-    img_str = str(fileobj.read())
-    xmp_start = img_str.find("<x:xmpmeta")
-    xmp_end = img_str.find("</x:xmpmeta")
-
-    if xmp_start < xmp_end:
-        xmp_str = img_str[xmp_start : xmp_end + 12]
-        xdict = parse_xmp_string(xmp_str)
-        if xdict is None:
-            return []
-        xdict = xdict.get("x:xmpmeta", {})
-        xdict = xdict.get("rdf:RDF", {})
-        xdict = xdict.get("rdf:Description", {})
-        if isinstance(xdict, list):
-            return xdict
+def _ends_with_partial_marker(buf: bytes) -> bool:
+    return any(
+        buf.endswith(xmp_start_marker[:i]) for i in range(1, len(xmp_start_marker))
+    )
+
+
+def get_xmp_fields(packet: bytes) -> Dict[str, str]:
+    """Extract the xmp_fields values of a raw XMP packet.
+
+    This avoids building the whole XMP tree for the few properties
+    we use. Keys follow xmltodict naming, i.e. '@' prefixed for
+    attributes. The first occurrence of a property wins.
+    """
+    fields = {}
+    for m in xmp_fields_re.finditer(packet):
+        if m.group(1) is not None:
+            key = "@" + m.group(1).decode()
+            value = m.group(2) if m.group(2) is not None else m.group(3)
         else:
-            return [xdict]
-    else:
-        return []
+            key = m.group(4).decode()
+            value = m.group(5).strip()
+        if key not in fields:
+            fields[key] = unescape_xml(value.decode("utf-8", "replace"))
+    return fields
 
 
-def get_gpano_from_xmp(xmp: List[Dict[str, Any]]) -> Dict[str, Any]:
-    for i in xmp:
-        for k in i:
-            if "GPano" in k:
-                return i
-    return {}
+def unescape_xml(value: str) -> str:
+    """Decode the XML predefined entities and numeric character references."""
+
+    def replace(m: "re.Match[str]") -> str:
+        if m.group(1) is not None:
+            return chr(int(m.group(1), 16))
+        if m.group(2) is not None:
+            return chr(int(m.group(2)))
+        return xml_entities[m.group(3)]
+
+    return xml_entity_re.sub(replace, value)
+
+
+def parse_exif_datetime(value: str) -> datetime.datetime:
+    """Parse a "YYYY:MM:DD HH:MM:SS.ffffff" EXIF time stamp.
+
+    Well-formed values are sliced directly, which is much faster than
+    strptime. Anything else goes through strptime to keep its validation
+    and errors.
+    """
+    fraction = value[20:]
+    digits = (
+        value[0:4]
+        + value[5:7]
+        + value[8:10]
+        + value[11:13]
+        + value[14:16]
+        + value[17:19]
+        + fraction
+    )
+    if (
+        0 < len(fraction) <= 6
+        and value[4] == value[7] == value[13] == value[16] == ":"
+        and value[10] == " "
+        and value[19] == "."
+        and digits.isascii()
+        and digits.isdigit()
+    ):
+        return datetime.datetime(
+            int(value[0:4]),
+            int(value[5:7]),
+            int(value[8:10]),
+            int(value[11:13]),
+            int(value[14:16]),
+            int(value[17:19]),
+            int(fraction.ljust(6, "0")),
+        )
+    return datetime.datetime.strptime(value, "%Y:%m:%d %H:%M:%S.%f")
 
 
 class EXIF:
@@ -184,12 +305,38 @@ class EXIF:
         self.image_size_loader: Callable[[], Tuple[int, int]] = image_size_loader
         self.use_exif_size: bool = use_exif_size
         self.fileobj: BinaryIO = fileobj
-        self.tags: Dict[str, Any] = exifread.process_file(fileobj, details=False)
-        fileobj.seek(0)
-        self.xmp: List[Dict[str, Any]] = get_xmp(fileobj)
+
+        # XMP usually lives in the file header, so scan the bytes already
+        # read before going back to the file.
+        header = fileobj.read(exif_header_size)
+        truncated = len(header) == exif_header_size
+        self.xmp_packet: Optional[bytes] = (
+            get_xmp_packet(fileobj, header) if truncated else get_xmp_packet(header)
+        )
+
+        # EXIF offsets may point anywhere in the file (e.g. TIFF), so exifread
+        # seeks in the file itself unless the header holds all of it.
+        if truncated:
+            fileobj.seek(0)
+        self.tags: Dict[str, Any] = exifread.process_file(
+            fileobj if truncated else BytesIO(header),
+            stop_tag=exif_stop_tag,
+            details=False,
+        )
+        self.xmp_fields: Dict[str, str] = (
+            get_xmp_fields(self.xmp_packet) if self.xmp_packet is not None else {}
+        )
+        self._image_size: Optional[Tuple[int, int]] = None
+        self._make: Optional[str] = None
+        self._model: Optional[str] = None
         self.fileobj_name: str = self.fileobj.name if name is None else name
 
     def extract_image_size(self) -> Tuple[int, int]:
+        if self._image_size is None:
+            self._image_size = self._compute_image_size()
+        return self._image_size
+
+    def _compute_image_size(self) -> Tuple[int, int]:
         if (
             self.use_exif_size
             and "EXIF ExifImageWidth" in self.tags
@@ -225,26 +372,29 @@ class EXIF:
 
     def extract_make(self) -> str:
         # Camera make and model
-        if "EXIF LensMake" in self.tags:
-            make = self.tags["EXIF LensMake"].values
-        elif "Image Make" in self.tags:
-            make = self.tags["Image Make"].values
-        else:
-            make = "unknown"
-        return self._decode_make_model(make)
+        if self._make is None:
+            if "EXIF LensMake" in self.tags:
+                make = self.tags["EXIF LensMake"].values
+            elif "Image Make" in self.tags:
+                make = self.tags["Image Make"].values
+            else:
+                make = "unknown"
+            self._make = self._decode_make_model(make)
+        return self._make
 
     def extract_model(self) -> str:
-        if "EXIF LensModel" in self.tags:
-            model = self.tags["EXIF LensModel"].values
-        elif "Image Model" in self.tags:
-            model = self.tags["Image Model"].values
-        else:
-            model = "unknown"
-        return self._decode_make_model(model)
+        if self._model is None:
+            if "EXIF LensModel" in self.tags:
+                model = self.tags["EXIF LensModel"].values
+            elif "Image Model" in self.tags:
+                model = self.tags["Image Model"].values
+            else:
+                model = "unknown"
+            self._model = self._decode_make_model(model)
+        return self._model
 
     def extract_projection_type(self) -> str:
-        gpano = get_gpano_from_xmp(self.xmp)
-        return gpano.get("GPano:ProjectionType", "perspective")
+        return self.xmp_fields.get("GPano:ProjectionType", "perspective")
 
     def extract_focal(self) -> Tuple[float, float]:
         make, model = self.extract_make(), self.extract_model()
@@ -287,20 +437,12 @@ class EXIF:
         Args:
             resolution_unit: the resolution unit value given in the EXIF
         """
-        global inch_in_mm
-        if resolution_unit == 2:  # inch
-            return inch_in_mm
-        elif resolution_unit == 3:  # cm
-            return cm_in_mm
-        elif resolution_unit == 4:  # mm
-            return 1
-        elif resolution_unit == 5:  # um
-            return um_in_mm
-        else:
+        mm_per_unit = mm_per_resolution_unit.get(resolution_unit)
+        if mm_per_unit is None:
             logger.warning(
                 "Unknown EXIF resolution unit value: {}".format(resolution_unit)
             )
-            return None
+        return mm_per_unit
 
     def extract_orientation(self) -> int:
         orientation = 1
@@ -311,19 +453,15 @@ class EXIF:
         return orientation
 
     def extract_ref_lon_lat(self) -> Tuple[str, str]:
-        if "GPS GPSLatitudeRef" in self.tags:
-            reflat = self.tags["GPS GPSLatitudeRef"].values
-        else:
-            reflat = "N"
-        if "GPS GPSLongitudeRef" in self.tags:
-            reflon = self.tags["GPS GPSLongitudeRef"].values
-        else:
-            reflon = "E"
+        reflat_tag = self.tags.get("GPS GPSLatitudeRef")
+        reflat = reflat_tag.values if reflat_tag is not None else "N"
+        reflon_tag = self.tags.get("GPS GPSLongitudeRef")
+        reflon = reflon_tag.values if reflon_tag is not None else "E"
         return reflon, reflat
 
     def extract_dji_lon_lat(self) -> Tuple[float, float]:
-        lon = self.xmp[0]["@drone-dji:Longitude"]
-        lat = self.xmp[0]["@drone-dji:Latitude"]
+        lon = self.xmp_fields["@drone-dji:Longitude"]
+        lat = self.xmp_fields["@drone-dji:Latitude"]
         lon_number = float(lon[1:])
         lat_number = float(lat[1:])
         lon_number = lon_number if lon[0] == "+" else -lon_number
@@ -331,27 +469,28 @@ class EXIF:
         return lon_number, lat_number
 
     def extract_dji_altitude(self) -> float:
-        return float(self.xmp[0]["@drone-dji:AbsoluteAltitude"])
+        return float(self.xmp_fields["@drone-dji:AbsoluteAltitude"])
 
     def has_xmp(self) -> bool:
-        return len(self.xmp) > 0
+        return self.xmp_packet is not None
 
     def has_dji_latlon(self) -> bool:
         return (
-            self.has_xmp()
-            and "@drone-dji:Latitude" in self.xmp[0]
-            and "@drone-dji:Longitude" in self.xmp[0]
+            "@drone-dji:Latitude" in self.xmp_fields
+            and "@drone-dji:Longitude" in self.xmp_fields
         )
 
     def has_dji_altitude(self) -> bool:
-        return self.has_xmp() and "@drone-dji:AbsoluteAltitude" in self.xmp[0]
+        return "@drone-dji:AbsoluteAltitude" in self.xmp_fields
 
     def extract_lon_lat(self) -> Tuple[Optional[float], Optional[float]]:
         if self.has_dji_latlon():
-            lon, lat = self.extract_dji_lon_lat()
-        elif "GPS GPSLatitude" in self.tags:
+            return self.extract_dji_lon_lat()
+
+        lat_tag = self.tags.get("GPS GPSLatitude")
+        if lat_tag is not None:
             reflon, reflat = self.extract_ref_lon_lat()
-            lat = gps_to_decimal(self.tags["GPS GPSLatitude"].values, reflat)
+            lat = gps_to_decimal(lat_tag.values, reflat)
             lon = gps_to_decimal(self.tags["GPS GPSLongitude"].values, reflon)
         else:
             lon, lat = None, None
@@ -359,9 +498,11 @@ class EXIF:
 
     def extract_altitude(self) -> Optional[float]:
         if self.has_dji_altitude():
-            altitude = self.extract_dji_altitude()
-        elif "GPS GPSAltitude" in self.tags:
-            alt_value = self.tags["GPS GPSAltitude"].values[0]
+            return self.extract_dji_altitude()
+
+        alt_tag = self.tags.get("GPS GPSAltitude")
+        if alt_tag is not None:
+            alt_value = alt_tag.values[0]
             if isinstance(alt_value, exifread.utils.Ratio):
                 altitude = eval_frac(alt_value)
             elif isinstance(alt_value, int):
@@ -370,9 +511,10 @@ class EXIF:
                 altitude = None
 
             # Check if GPSAltitudeRef is equal to 1, which means GPSAltitude should be negative, reference: http://www.exif.org/Exif2-2.PDF#page=53
+            alt_ref_tag = self.tags.get("GPS GPSAltitudeRef")
             if (
-                "GPS GPSAltitudeRef" in self.tags
-                and self.tags["GPS GPSAltitudeRef"].values[0] == 1
+                alt_ref_tag is not None
+                and alt_ref_tag.values[0] == 1
                 and altitude is not None
             ):
                 altitude = -altitude
@@ -381,8 +523,9 @@ class EXIF:
         return altitude
 
     def extract_dop(self) -> Optional[float]:
-        if "GPS GPSDOP" in self.tags:
-            return eval_frac(self.tags["GPS GPSDOP"].values[0])
+        dop_tag = self.tags.get("GPS GPSDOP")
+        if dop_tag is not None:
+            return eval_frac(dop_tag.values[0])
         return None
 
     def extract_geo(self) -> Dict[str, Any]:
@@ -401,8 +544,9 @@ class EXIF:
         return d
 
     def extract_capture_time(self) -> float:
+        gps_date_tag = self.tags.get("GPS GPSDate")
         if (
-            "GPS GPSDate" in self.tags
+            gps_date_tag is not None
             and "GPS GPSTimeStamp" in self.tags  # Actually GPSDateStamp
         ):
             try:
@@ -413,14 +557,11 @@ class EXIF:
                 hours = int(hours_f)
                 minutes = int(minutes_f)
                 seconds = get_tag_as_float(self.tags, "GPS GPSTimeStamp", 2)
-                gps_timestamp_string = "{0:s} {1:02d}:{2:02d}:{3:02f}".format(
-                    self.tags["GPS GPSDate"].values, hours, minutes, seconds
+                gps_timestamp_string = "{0:s} {1:02d}:{2:02d}:{3:09.6f}".format(
+                    gps_date_tag.values, hours, minutes, seconds
                 )
                 return (
-                    datetime.datetime.strptime(
-                        gps_timestamp_string, "%Y:%m:%d %H:%M:%S.%f"
-                    )
-                    - datetime.datetime(1970, 1, 1)
+                    parse_exif_datetime(gps_timestamp_string) - unix_epoch
                 ).total_seconds()
             except (TypeError, ValueError):
                 logger.info(
@@ -434,15 +575,14 @@ class EXIF:
             ("Image DateTime", "Image SubSecTime", "Image Tag 0x9010"),
         ]
         for datetime_tag, subsec_tag, offset_tag in time_strings:
-            if datetime_tag in self.tags:
-                date_time = self.tags[datetime_tag].values
-                if subsec_tag in self.tags:
-                    subsec_time = self.tags[subsec_tag].values
-                else:
-                    subsec_time = "0"
+            date_time_value = self.tags.get(datetime_tag)
+            if date_time_value is not None:
+                date_time = date_time_value.values
+                subsec_value = self.tags.get(subsec_tag)
+                subsec_time = subsec_value.values if subsec_value is not None else "0"
                 try:
                     s = "{0:s}.{1:s}".format(date_time, subsec_time)
-                    d = datetime.datetime.strptime(s, "%Y:%m:%d %H:%M:%S.%f")
+                    d = parse_exif_datetime(s)
                 except ValueError:
                     logger.debug(
                         'The "{1:s}" time stamp or "{2:s}" tag is invalid in '
@@ -452,8 +592,9 @@ class EXIF:
                     )
                     continue
                 # Test for OffsetTimeOriginal | OffsetTimeDigitized | OffsetTime
-                if offset_tag in self.tags:
-                    offset_time = self.tags[offset_tag].values
+                offset_value = self.tags.get(offset_tag)
+                if offset_value is not None:
+                    offset_time = offset_value.values
                     try:
                         d += datetime.timedelta(
                             hours=-int(offset_time[0:3]), minutes=int(offset_time[4:6])
@@ -477,7 +618,7 @@ class EXIF:
                             datetime_tag, self.fileobj_name
                         )
                     )
-                return (d - datetime.datetime(1970, 1, 1)).total_seconds()
+                return (d - unix_epoch).total_seconds()
         logger.info(
             'Image file "{0:s}" has no valid time stamp'.format(self.fileobj_name)
         )
@@ -486,8 +627,16 @@ class EXIF:
     def extract_opk(self, geo: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         opk = None
 
-        if self.has_xmp() and geo and "latitude" in geo and "longitude" in geo:
-            ypr = np.array([None, None, None])
+        # Most images carry no camera orientation at all
+        if (
+            "@Camera:Yaw" not in self.xmp_fields
+            and "@drone-dji:GimbalYawDegree" not in self.xmp_fields
+        ):
+            return opk
+
+        if geo and "latitude" in geo and "longitude" in geo:
+            ypr = np.full(3, np.nan)
+            have_ypr = False
 
             try:
                 # YPR conventions (assuming nadir camera)
@@ -499,30 +648,32 @@ class EXIF:
                 # Roll: 0 (assuming gimbal)
 
                 if (
-                    "@Camera:Yaw" in self.xmp[0]
-                    and "@Camera:Pitch" in self.xmp[0]
-                    and "@Camera:Roll" in self.xmp[0]
+                    "@Camera:Yaw" in self.xmp_fields
+                    and "@Camera:Pitch" in self.xmp_fields
+                    and "@Camera:Roll" in self.xmp_fields
                 ):
                     ypr = np.array(
                         [
-                            float(self.xmp[0]["@Camera:Yaw"]),
-                            float(self.xmp[0]["@Camera:Pitch"]),
-                            float(self.xmp[0]["@Camera:Roll"]),
+                            float(self.xmp_fields["@Camera:Yaw"]),
+                            float(self.xmp_fields["@Camera:Pitch"]),
+                            float(self.xmp_fields["@Camera:Roll"]),
                         ]
                     )
+                    have_ypr = True
                 elif (
-                    "@drone-dji:GimbalYawDegree" in self.xmp[0]
-                    and "@drone-dji:GimbalPitchDegree" in self.xmp[0]
-                    and "@drone-dji:GimbalRollDegree" in self.xmp[0]
+                    "@drone-dji:GimbalYawDegree" in self.xmp_fields
+                    and "@drone-dji:GimbalPitchDegree" in self.xmp_fields
+                    and "@drone-dji:GimbalRollDegree" in self.xmp_fields
                 ):
                     ypr = np.array(
                         [
-                            float(self.xmp[0]["@drone-dji:GimbalYawDegree"]),
-                            float(self.xmp[0]["@drone-dji:GimbalPitchDegree"]),
-                            float(self.xmp[0]["@drone-dji:GimbalRollDegree"]),
+                            float(self.xmp_fields["@drone-dji:GimbalYawDegree"]),
+                            float(self.xmp_fields["@drone-dji:GimbalPitchDegree"]),
+                            float(self.xmp_fields["@drone-dji:GimbalRollDegree"]),
                         ]
                     )
                     ypr[1] += 90  # DJI's values need to be offset
+                    have_ypr = True
             except ValueError:
                 logger.debug(
                     'Invalid yaw/pitch/roll tag in image file "{0:s}"'.format(
@@ -530,7 +681,7 @@ class EXIF:
                     )
                 )
 
-            if np.all(ypr) is not None:
+            if have_ypr:
                 ypr = np.radians(ypr)
 
                 # Convert YPR --> OPK
@@ -538,22 +689,15 @@ class EXIF:
                 # Georeferencing of Image and Scanner Data Using the
                 # Position and Angular Data of an Hybrid Inertial Navigation System
                 # by Manfred Bäumker
-                y, p, r = ypr
+                sy, sp, sr = np.sin(ypr)
+                cy, cp, cr = np.cos(ypr)
 
                 # YPR rotation matrix
                 cnb = np.array(
                     [
-                        [
-                            np.cos(y) * np.cos(p),
-                            np.cos(y) * np.sin(p) * np.sin(r) - np.sin(y) * np.cos(r),
-                            np.cos(y) * np.sin(p) * np.cos(r) + np.sin(y) * np.sin(r),
-                        ],
-                        [
-                            np.sin(y) * np.cos(p),
-                            np.sin(y) * np.sin(p) * np.sin(r) + np.cos(y) * np.cos(r),
-                            np.sin(y) * np.sin(p) * np.cos(r) - np.cos(y) * np.sin(r),
-                        ],
-                        [-np.sin(p), np.cos(p) * np.sin(r), np.cos(p) * np.cos(r)],
+                        [cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr],
+                        [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr],
+                        [-sp, cp * sr, cp * cr],
                     ]
                 )
 
@@ -566,31 +710,17 @@ class EXIF:
                 # (Swap X/Y, flip Z)
                 cbb = np.array([[0, 1, 0], [1, 0, 0], [0, 0, -1]])
 
-                delta = 1e-7
-
-                p1 = np.array(
-                    ecef_from_lla(
-                        geo["latitude"] + delta,
-                        geo["longitude"],
-                        geo.get("altitude", 0),
-                    )
-                )
-                p2 = np.array(
-                    ecef_from_lla(
-                        geo["latitude"] - delta,
-                        geo["longitude"],
-                        geo.get("altitude", 0),
-                    )
+                # Unit vector pointing north, i.e. the ECEF direction
+                # of increasing latitude along the meridian
+                lat = np.radians(geo["latitude"])
+                lon = np.radians(geo["longitude"])
+                xnp = np.array(
+                    [
+                        -np.sin(lat) * np.cos(lon),
+                        -np.sin(lat) * np.sin(lon),
+                        np.cos(lat),
+                    ]
                 )
-                xnp = p1 - p2
-                m = np.linalg.norm(xnp)
-
-                if m == 0:
-                    logger.debug("Cannot compute OPK angles, divider = 0")
-                    return opk
-
-                # Unit vector pointing north
-                xnp /= m
 
                 znp = np.array([0, 0, -1]).T
                 ynp = np.cross(znp, xnp)
@@ -598,7 +728,7 @@ class EXIF:
                 cen = np.array([xnp, ynp, znp]).T
 
                 # OPK rotation matrix
-                ceb = cen.dot(cnb).dot(cbb)
+                ceb = np.linalg.multi_dot([cen, cnb, cbb])
 
                 opk = {}
                 opk["omega"] = np.degrees(np.arctan2(-ceb[1][2], ceb[2][2]))
@@ -643,16 +773,19 @@ def hard_coded_calibration(exif: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     if make not in raw_calibrations:
         return None
     models = raw_calibrations[make]
+
+    # camera_calibration() is cached, return copies so that callers
+    # can't modify the entries shared by all images
     if "ALL" in models:
-        return models["ALL"]
+        return dict(models["ALL"])
     if "MODEL" in models:
         if model not in models["MODEL"]:
             return None
-        return models["MODEL"][model]
+        return dict(models["MODEL"][model])
     if "FOCAL" in models:
         if fmm35 not in models["FOCAL"]:
             return None
-        return models["FOCAL"][fmm35]
+        return dict(models["FOCAL"][fmm35])
     return None
 
 
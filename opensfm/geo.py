@@ -1,5 +1,5 @@
 # pyre-strict
-from typing import overload, Sequence, Tuple, Union
+from typing import Optional, overload, Sequence, Tuple, Union
 
 import numpy as np
 from numpy.typing import NDArray
@@ -104,6 +104,33 @@ def ecef_from_topocentric_transform(lat: float, lon: float, alt: float) -> NDArr
     )
 
 
+def topocentric_from_ecef_transform(lat: float, lon: float, alt: float) -> NDArray:
+    """
+    Transformation from ECEF to a topocentric frame at reference position.
+
+    Inverse of ecef_from_topocentric_transform, computed in closed form
+    from its orthonormal rotation part.
+    >>> a = topocentric_from_ecef_transform(30, 20, 10)
+    >>> b = np.linalg.inv(ecef_from_topocentric_transform(30, 20, 10))
+    >>> np.allclose(a, b)
+    True
+    """
+    T = ecef_from_topocentric_transform(lat, lon, alt)
+    Tinv = np.identity(4)
+    Tinv[:3, :3] = T[:3, :3].T
+    Tinv[:3, 3] = -T[:3, :3].T.dot(T[:3, 3])
+    return Tinv
+
+
+def _apply_transform(
+    T: NDArray, x: Scalars, y: Scalars, z: Scalars
+) -> Tuple[Scalars, Scalars, Scalars]:
+    tx = T[0, 0] * x + T[0, 1] * y + T[0, 2] * z + T[0, 3]
+    ty = T[1, 0] * x + T[1, 1] * y + T[1, 2] * z + T[1, 3]
+    tz = T[2, 0] * x + T[2, 1] * y + T[2, 2] * z + T[2, 3]
+    return tx, ty, tz
+
+
 def ecef_from_topocentric_transform_finite_diff(
     lat: float, lon: float, alt: float
 ) -> NDArray:
@@ -193,13 +220,10 @@ def topocentric_from_lla(
     ...     [lat, lon, alt])
     True
     """
-    T = np.linalg.inv(ecef_from_topocentric_transform(reflat, reflon, refalt))
+    T = topocentric_from_ecef_transform(reflat, reflon, refalt)
     # pyre-ignore[6]: pyre gets confused with Scalar vs float vs NDarray
     x, y, z = ecef_from_lla(lat, lon, alt)
-    tx = T[0, 0] * x + T[0, 1] * y + T[0, 2] * z + T[0, 3]
-    ty = T[1, 0] * x + T[1, 1] * y + T[1, 2] * z + T[1, 3]
-    tz = T[2, 0] * x + T[2, 1] * y + T[2, 2] * z + T[2, 3]
-    return tx, ty, tz
+    return _apply_transform(T, x, y, z)
 
 
 @overload
@@ -234,9 +258,7 @@ def lla_from_topocentric(
     Transform from topocentric XYZ to lat, lon, alt.
     """
     T = ecef_from_topocentric_transform(reflat, reflon, refalt)
-    ex = T[0, 0] * x + T[0, 1] * y + T[0, 2] * z + T[0, 3]
-    ey = T[1, 0] * x + T[1, 1] * y + T[1, 2] * z + T[1, 3]
-    ez = T[2, 0] * x + T[2, 1] * y + T[2, 2] * z + T[2, 3]
+    ex, ey, ez = _apply_transform(T, x, y, z)
     return lla_from_ecef(ex, ey, ez)
 
 
@@ -278,6 +300,17 @@ class TopocentricConverter:
         self.lat = reflat
         self.lon = reflon
         self.alt = refalt
+        self._transforms_origin: Optional[Tuple[float, float, float]] = None
+        self._ecef_from_topocentric: NDArray = np.identity(4)
+        self._topocentric_from_ecef: NDArray = np.identity(4)
+
+    def _update_transforms(self) -> None:
+        """Compute the reference transforms once per reference origin."""
+        origin = (self.lat, self.lon, self.alt)
+        if self._transforms_origin != origin:
+            self._ecef_from_topocentric = ecef_from_topocentric_transform(*origin)
+            self._topocentric_from_ecef = topocentric_from_ecef_transform(*origin)
+            self._transforms_origin = origin
 
     @overload
     def to_topocentric(
@@ -292,8 +325,10 @@ class TopocentricConverter:
         self, lat: Scalars, lon: Scalars, alt: Scalars
     ) -> Tuple[Scalars, Scalars, Scalars]:
         """Convert lat, lon, alt to topocentric x, y, z."""
+        self._update_transforms()
         # pyre-ignore[6]: pyre gets confused with Scalar vs float vs NDarray
-        return topocentric_from_lla(lat, lon, alt, self.lat, self.lon, self.alt)
+        x, y, z = ecef_from_lla(lat, lon, alt)
+        return _apply_transform(self._topocentric_from_ecef, x, y, z)
 
     @overload
     def to_lla(self, x: float, y: float, z: float) -> Tuple[float, float, float]: ...
@@ -306,8 +341,10 @@ class TopocentricConverter:
         self, x: Scalars, y: Scalars, z: Scalars
     ) -> Tuple[Scalars, Scalars, Scalars]:
         """Convert topocentric x, y, z to lat, lon, alt."""
+        self._update_transforms()
+        ex, ey, ez = _apply_transform(self._ecef_from_topocentric, x, y, z)
         # pyre-ignore[6]: pyre gets confused with Scalar vs float vs NDarray
-        return lla_from_topocentric(x, y, z, self.lat, self.lon, self.alt)
+        return lla_from_ecef(ex, ey, ez)
 
     def __eq__(self, o: "TopocentricConverter") -> bool:
         return np.allclose([self.lat, self.lon, self.alt], (o.lat, o.lon, o.alt))
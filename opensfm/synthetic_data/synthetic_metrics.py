@@ -1,27 +1,35 @@
 # pyre-strict
 import copy
-from typing import Dict, List, Tuple
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
 
-import cv2
 import numpy as np
-import opensfm.transformations as tf
 from numpy.typing import NDArray
 from opensfm import align, geo, multiview, pymap, types
 
 
+def _common_ids(ids0: Iterable[str], ids1: Iterable[str]) -> List[str]:
+    """Ids present in both collections, building a single set."""
+    return list(set(ids0).intersection(ids1))
+
+
+def _as_vectors(values: Iterable[NDArray]) -> NDArray:
+    """Stack 3-vectors into an (N, 3) float array, (0, 3) when empty."""
+    return np.array(list(values), dtype=np.float64).reshape(-1, 3)
+
+
 def points_errors(
     reference: types.Reconstruction, candidate: types.Reconstruction
 ) -> NDArray:
-    common_points = set(reference.points.keys()).intersection(
-        set(candidate.points.keys())
-    )
+    common_points = _common_ids(reference.points.keys(), candidate.points.keys())
 
-    return np.array(
-        [
-            reference.points[p].coordinates - candidate.points[p].coordinates
-            for p in common_points
-        ]
+    reference_coords = _as_vectors(
+        reference.points[p].coordinates for p in common_points
+    )
+    candidate_coords = _as_vectors(
+        candidate.points[p].coordinates for p in common_points
     )
+    return reference_coords - candidate_coords
 
 
 def completeness_errors(
@@ -34,57 +42,99 @@ def completeness_errors(
 
 
 def gps_errors(candidate: types.Reconstruction) -> NDArray:
-    errors = []
+    shots_per_camera = defaultdict(list)
     for shot in candidate.shots.values():
-        bias = candidate.biases[shot.camera.id]
-        pose1 = bias.transform(shot.metadata.gps_position.value)
-        pose2 = shot.pose.get_origin()
-        errors.append(pose1 - pose2)
-    return np.array(errors)
+        shots_per_camera[shot.camera.id].append(shot)
+
+    # Apply each camera bias (y = s R x + t) to all its shots at once,
+    # writing every camera block straight into the output
+    errors = np.empty((len(candidate.shots), 3))
+    start = 0
+    for camera_id, shots in shots_per_camera.items():
+        bias = candidate.biases[camera_id]
+        gps = _as_vectors(shot.metadata.gps_position.value for shot in shots)
+        origins = _as_vectors(shot.pose.get_origin() for shot in shots)
+        sR = bias.scale * bias.get_rotation_matrix()
+        block = errors[start : start + len(shots)]
+        np.dot(gps, sR.T, out=block)
+        block += bias.translation
+        block -= origins
+        start += len(shots)
+    return errors
 
 
 def gcp_errors(
     candidate: types.Reconstruction, gcps: Dict[str, pymap.GroundControlPoint]
 ) -> NDArray:
-    errors = []
-    for gcp in gcps.values():
-        if not gcp.lla:
+    valid_gcps = [gcp for gcp in gcps.values() if gcp.lla]
+    triangulated, llas = [], []
+    for gcp in valid_gcps:
+        point = multiview.triangulate_gcp(gcp, candidate.shots, 1.0, 0.1)
+        if point is None:
             continue
 
-        triangulated = multiview.triangulate_gcp(gcp, candidate.shots, 1.0, 0.1)
-        if triangulated is None:
-            continue
+        triangulated.append(point)
+        llas.append(gcp.lla_vec)
+    if not triangulated:
+        return np.array([])
 
-        gcp_enu = candidate.reference.to_topocentric(*gcp.lla_vec)
-        errors.append(triangulated - gcp_enu)
-    return np.array(errors)
+    # Convert all GCP positions to the reference frame in one go
+    lla = _as_vectors(llas)
+    gcp_enu = np.column_stack(
+        candidate.reference.to_topocentric(lla[:, 0], lla[:, 1], lla[:, 2])
+    )
+    return _as_vectors(triangulated) - gcp_enu
 
 
 def position_errors(
     reference: types.Reconstruction, candidate: types.Reconstruction
 ) -> NDArray:
-    common_shots = set(reference.shots.keys()).intersection(set(candidate.shots.keys()))
-    errors = []
-    for s in common_shots:
-        pose1 = reference.shots[s].pose.get_origin()
-        pose2 = candidate.shots[s].pose.get_origin()
-        errors.append(pose1 - pose2)
-    return np.array(errors)
+    common_shots = _common_ids(reference.shots.keys(), candidate.shots.keys())
+    origins1, _ = _shot_poses(reference, common_shots)
+    origins2, _ = _shot_poses(candidate, common_shots)
+    return origins1 - origins2
 
 
 def rotation_errors(
     reference: types.Reconstruction, candidate: types.Reconstruction
 ) -> NDArray:
-    common_shots = set(reference.shots.keys()).intersection(set(candidate.shots.keys()))
-    errors = []
-    for s in common_shots:
-        pose1 = reference.shots[s].pose.get_rotation_matrix()
-        pose2 = candidate.shots[s].pose.get_rotation_matrix()
-        difference = np.transpose(pose1).dot(pose2)
-        rodrigues = cv2.Rodrigues(difference)[0].ravel()
-        angle = np.linalg.norm(rodrigues)
-        errors.append(angle)
-    return np.array(errors)
+    common_shots = _common_ids(reference.shots.keys(), candidate.shots.keys())
+    _, rotations1 = _shot_poses(reference, common_shots)
+    _, rotations2 = _shot_poses(candidate, common_shots)
+    return _rotation_angles(rotations1, rotations2)
+
+
+def pose_errors(
+    reference: types.Reconstruction, candidate: types.Reconstruction
+) -> Tuple[NDArray, NDArray]:
+    """Position and rotation errors, reading each common shot pose once.
+
+    Same as (position_errors, rotation_errors) for the pair.
+    """
+    common_shots = _common_ids(reference.shots.keys(), candidate.shots.keys())
+    origins1, rotations1 = _shot_poses(reference, common_shots)
+    origins2, rotations2 = _shot_poses(candidate, common_shots)
+    return origins1 - origins2, _rotation_angles(rotations1, rotations2)
+
+
+def _shot_poses(
+    reconstruction: types.Reconstruction, shot_ids: List[str]
+) -> Tuple[NDArray, NDArray]:
+    """Stacked (N, 3) origins and (N, 3, 3) rotations of the given shots."""
+    poses = [reconstruction.shots[s].pose for s in shot_ids]
+    origins = _as_vectors(p.get_origin() for p in poses)
+    rotations = np.array([p.get_rotation_matrix() for p in poses], dtype=np.float64)
+    return origins, rotations.reshape(-1, 3, 3)
+
+
+def _rotation_angles(rotations1: NDArray, rotations2: NDArray) -> NDArray:
+    # Angle of the relative rotations R1^T R2 from their axis-angle form:
+    # the skew part has norm 2 sin(angle) and the trace is 1 + 2 cos(angle)
+    differences = np.matmul(rotations1.transpose(0, 2, 1), rotations2)
+    skew = differences[:, (2, 0, 1), (1, 2, 0)] - differences[:, (1, 2, 0), (2, 0, 1)]
+    sines = np.sqrt(np.einsum("ni,ni->n", skew, skew))
+    cosines = np.einsum("nii->n", differences) - 1.0
+    return np.arctan2(sines, cosines)
 
 
 def find_alignment(
@@ -99,12 +149,29 @@ def find_alignment(
         if p0 is not None and p1 is not None:
             v0.append(p0)
             v1.append(p1)
-    v0 = np.array(v0).T
-    v1 = np.array(v1).T
-    M = tf.affine_matrix_from_points(v0, v1, shear=False)
-    s = np.linalg.det(M[:3, :3]) ** (1.0 / 3.0)
-    A = M[:3, :3] / s
-    b = M[:3, 3]
+    return find_alignment_arr(_as_vectors(v0), _as_vectors(v1))
+
+
+def find_alignment_arr(v0: NDArray, v1: NDArray) -> Tuple[float, NDArray, NDArray]:
+    """Compute similarity transform between (N, 3) arrays of matching points.
+
+    Returns (s, A, b) such that ``v1 = s * A * v0 + b``
+    """
+    if v0.shape != v1.shape or v0.ndim != 2 or v0.shape[1] != 3 or len(v0) < 3:
+        raise ValueError("input arrays are of wrong shape or type")
+
+    # Closed-form similarity (Kabsch rotation, ratio of RMS deviations
+    # for scale), same estimate as affine_matrix_from_points(shear=False)
+    c0 = v0.mean(axis=0)
+    c1 = v1.mean(axis=0)
+    d0 = v0 - c0
+    d1 = v1 - c1
+    U, _, Vt = np.linalg.svd(d1.T.dot(d0))
+    if np.linalg.det(U.dot(Vt)) < 0.0:
+        U[:, 2] = -U[:, 2]
+    A = U.dot(Vt)
+    s = np.sqrt(np.sum(d1**2) / np.sum(d0**2))
+    b = c1 - s * A.dot(c0)
     return s, A, b
 
 
@@ -112,21 +179,22 @@ def aligned_to_reference(
     reference: types.Reconstruction, reconstruction: types.Reconstruction
 ) -> types.Reconstruction:
     """Align a reconstruction to a reference."""
-    coords1, coords2 = [], []
-    for point1 in reconstruction.points.values():
-        point2 = reference.points.get(point1.id)
-        if point2 is not None:
-            coords1.append(point1.coordinates)
-            coords2.append(point2.coordinates)
-
-    if len(coords1) == 0 or len(coords2) == 0:
-        for shot1 in reconstruction.shots.values():
-            shot2 = reference.shots.get(shot1.id)
-            if shot2 is not None:
-                coords1.append(shot1.pose.get_origin())
-                coords2.append(shot2.pose.get_origin())
-
-    s, A, b = find_alignment(coords1, coords2)
+    common_points = _common_ids(reconstruction.points.keys(), reference.points.keys())
+    if common_points:
+        coords1 = _as_vectors(
+            reconstruction.points[p].coordinates for p in common_points
+        )
+        coords2 = _as_vectors(reference.points[p].coordinates for p in common_points)
+    else:
+        common_shots = _common_ids(reconstruction.shots.keys(), reference.shots.keys())
+        coords1 = _as_vectors(
+            reconstruction.shots[s].pose.get_origin() for s in common_shots
+        )
+        coords2 = _as_vectors(
+            reference.shots[s].pose.get_origin() for s in common_shots
+        )
+
+    s, A, b = find_alignment_arr(coords1, coords2)
     aligned = copy.deepcopy(reconstruction)
     align.apply_similarity(aligned, s, A, b)
     return aligned
@@ -145,21 +213,33 @@ def change_geo_reference(
     """
     t_old_new = reconstruction.reference.to_topocentric(latitude, longitude, altitude)
 
-    s = 1.0
-    A = np.eye(3)
     b = -np.array(t_old_new)
     aligned = copy.deepcopy(reconstruction)
     aligned.reference = geo.TopocentricConverter(latitude, longitude, altitude)
-    align.apply_similarity(aligned, s, A, b)
-    for shot in aligned.shots.values():
-        if shot.metadata.gps_position.has_value:
-            shot.metadata.gps_position.value = shot.metadata.gps_position.value + b
+    align.apply_translation(aligned, b)
+
+    # Translate all GPS priors at once, then write them back
+    gps_metadata = [
+        shot.metadata.gps_position
+        for shot in aligned.shots.values()
+        if shot.metadata.gps_position.has_value
+    ]
+    if gps_metadata:
+        gps = _as_vectors(m.value for m in gps_metadata)
+        gps += b
+        for m, position in zip(gps_metadata, gps):
+            m.value = position
     return aligned
 
 
 def rmse(errors: NDArray) -> float:
-    return np.sqrt(np.mean(errors**2))
+    # Sum of squares as one reduction, without an errors**2 temporary
+    flat = np.ravel(errors)
+    return np.sqrt(np.einsum("i,i->", flat, flat) / flat.size)
 
 
 def mad(errors: NDArray) -> float:
-    return np.median(np.absolute(errors - np.median(errors)))
+    # Single scratch buffer for the deviations, also reused by the median sort
+    deviations = np.subtract(errors, np.median(errors))
+    np.absolute(deviations, out=deviations)
+    return np.median(deviations, overwrite_input=True)
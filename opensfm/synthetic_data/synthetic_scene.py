@@ -485,15 +485,13 @@ def compare(
     completeness = sm.completeness_errors(reference, reconstruction)
 
     geo_referenced = sm.change_geo_reference(reconstruction, geo.lat, geo.lon, geo.alt)
-    absolute_position = sm.position_errors(reference, geo_referenced)
-    absolute_rotation = sm.rotation_errors(reference, geo_referenced)
+    absolute_position, absolute_rotation = sm.pose_errors(reference, geo_referenced)
     absolute_points = sm.points_errors(reference, geo_referenced)
     absolute_gps = sm.gps_errors(geo_referenced)
     absolute_gcp = sm.gcp_errors(geo_referenced, gcps)
 
     aligned = sm.aligned_to_reference(reference, geo_referenced)
-    aligned_position = sm.position_errors(reference, aligned)
-    aligned_rotation = sm.rotation_errors(reference, aligned)
+    aligned_position, aligned_rotation = sm.pose_errors(reference, aligned)
     aligned_points = sm.points_errors(reference, aligned)
     aligned_gps = sm.gps_errors(aligned)
 
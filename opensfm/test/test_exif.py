@@ -0,0 +1,233 @@
+# pyre-strict
+import datetime
+import struct
+from io import BytesIO
+from typing import Any
+
+import numpy as np
+import pytest
+import xmltodict
+from exifread.utils import Ratio
+from opensfm import exif
+
+
+xmp_packet: bytes = (
+    b'<x:xmpmeta xmlns:x="adobe:ns:meta/">'
+    b'<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">'
+    b'<rdf:Description rdf:about="" drone-dji:Latitude="+46.1"'
+    b" drone-dji:Longitude='-7.2' drone-dji:GimbalYawDegree=\"10.5\"/>"
+    b"<rdf:Description>"
+    b"<GPano:ProjectionType> equirectangular </GPano:ProjectionType>"
+    b"</rdf:Description>"
+    b"</rdf:RDF></x:xmpmeta>"
+)
+
+
+def test_get_xmp_packet() -> None:
+    header = b"\xff\xd8" + b"\x00" * 100 + xmp_packet + b"\x00" * 100
+    assert exif.get_xmp_packet(header) == xmp_packet
+    assert exif.get_xmp_packet(b"\xff\xd8" + b"\x00" * 100) is None
+
+
+def test_get_xmp_packet_past_first_chunk() -> None:
+    for offset in (
+        exif.xmp_read_chunk_size - 5,  # start marker straddles two chunks
+        150 * 1024,
+        exif.exif_header_size - 5,  # start marker straddles the header end
+        exif.exif_header_size - 100,  # packet ends past the header
+    ):
+        data = b"\xff\xd8" + b"\x00" * offset + xmp_packet + b"\x00" * 100
+        assert exif.get_xmp_packet(data) == xmp_packet
+        assert exif.get_xmp_packet(BytesIO(data)) == xmp_packet
+
+        fileobj = BytesIO(data)
+        head = fileobj.read(exif.exif_header_size)
+        assert exif.get_xmp_packet(fileobj, head) == xmp_packet
+
+
+def test_get_xmp_packet_reads_header_only() -> None:
+    class CountingIO(BytesIO):
+        bytes_read = 0
+
+        def read(self, size: int = -1) -> bytes:
+            data = super().read(size)
+            self.bytes_read += len(data)
+            return data
+
+    data = b"\xff\xd8" + b"\x00" * 6 * 1024 * 1024
+    fileobj = CountingIO(data)
+    assert exif.get_xmp_packet(fileobj) is None
+    assert fileobj.bytes_read == exif.exif_header_size
+
+    # Packets starting past the header are not looked for in files
+    data = b"\xff\xd8" + b"\x00" * exif.exif_header_size + xmp_packet
+    assert exif.get_xmp_packet(data) == xmp_packet
+    assert exif.get_xmp_packet(BytesIO(data)) is None
+
+
+def test_xmp_fields_past_first_chunk() -> None:
+    data = b"\xff\xd8" + b"\x00" * 150 * 1024 + xmp_packet + b"\x00" * 200 * 1024
+    e = exif.EXIF(BytesIO(data), lambda: (480, 640), name="test.jpg")
+    assert e.xmp_fields["@drone-dji:GimbalYawDegree"] == "10.5"
+    assert e.extract_projection_type() == "equirectangular"
+
+
+def test_xmp_fields_match_full_parse() -> None:
+    packet = xmp_packet.replace(
+        b"</rdf:RDF>",
+        b'<rdf:Description Camera:Yaw="&quot;1&apos;0&#46;5&#x35;&amp;#65;">'
+        b"<Camera:Pitch>&lt;2&gt; &#x2013;</Camera:Pitch>"
+        b"</rdf:Description></rdf:RDF>",
+    )
+    fields = exif.get_xmp_fields(packet)
+    xmp = xmltodict.parse(packet.decode(), process_namespaces=False)
+    descriptions = xmp["x:xmpmeta"]["rdf:RDF"]["rdf:Description"]
+
+    assert len(descriptions) == 3
+    for key in ("@drone-dji:Latitude", "@drone-dji:Longitude"):
+        assert fields[key] == descriptions[0][key]
+    assert fields["@drone-dji:GimbalYawDegree"] == "10.5"
+    assert fields["GPano:ProjectionType"] == descriptions[1]["GPano:ProjectionType"]
+    assert fields["@Camera:Yaw"] == descriptions[2]["@Camera:Yaw"] == "\"1'0.55&#65;"
+    assert fields["Camera:Pitch"] == descriptions[2]["Camera:Pitch"]
+    assert "@drone-dji:GimbalPitchDegree" not in fields
+
+
+def test_camera_id_format() -> None:
+    assert (
+        exif.camera_id_("Apple", "Apple iPhone 4S", 3264, 2448, "perspective", 0.97222)
+        == "v2 apple iphone 4s 3264 2448 perspective 0.9722"
+    )
+    assert (
+        exif.camera_id_("unknown", "unknown", 640, 480, "fisheye", 1)
+        == "v2 unknown unknown 640 480 fisheye 1.0"
+    )
+
+
+def tiff_with_far_tags() -> bytes:
+    """Little-endian TIFF whose Make and EXIF sub-IFD lie past the header."""
+    make_offset = exif.exif_header_size + 1000
+    exif_ifd_offset = make_offset + 16
+    focal_offset = exif_ifd_offset + 18
+    make = b"Hasselblad\x00"
+
+    ifd0 = struct.pack("<H", 2)
+    ifd0 += struct.pack("<HHII", 0x010F, 2, len(make), make_offset)  # Make
+    ifd0 += struct.pack("<HHII", 0x8769, 4, 1, exif_ifd_offset)  # ExifOffset
+    ifd0 += struct.pack("<I", 0)
+    data = b"II*\x00" + struct.pack("<I", 8) + ifd0
+    data += b"\x00" * (make_offset - len(data)) + make
+    data += b"\x00" * (exif_ifd_offset - len(data))
+    data += struct.pack("<H", 1)
+    data += struct.pack("<HHII", 0x920A, 5, 1, focal_offset)  # FocalLength
+    data += struct.pack("<I", 0)
+    data += struct.pack("<II", 7, 2)
+    return data
+
+
+def test_exif_tags_past_header() -> None:
+    e = exif.EXIF(BytesIO(tiff_with_far_tags()), lambda: (480, 640), name="a.tif")
+    assert e.extract_make() == "Hasselblad"
+    assert exif.get_tag_as_float(e.tags, "EXIF FocalLength") == 3.5
+
+
+def test_hard_coded_calibration_not_shared() -> None:
+    metadata = {"make": "Garmin", "model": "VIRB", "focal_ratio": 0.5}
+    for projection_type in ("fisheye", "perspective"):
+        metadata["projection_type"] = projection_type
+        # pyre-fixme[6]: the dataset is only used when no calibration is found
+        calib = exif.calibration_from_metadata(metadata, None)
+        assert calib["focal"] == 0.57
+        assert calib["projection_type"] == projection_type
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2021:03:04 05:06:07.1",
+        "2021:03:04 05:06:07.12",
+        "2021:03:04 05:06:07.123",
+        "2021:03:04 05:06:07.1234",
+        "2021:03:04 05:06:07.12345",
+        "2021:03:04 05:06:07.123456",
+        "2021:03:04 05:06:07.1234567",
+        "2021:3:4 5:6:7.5",
+        "2021:02:30 05:06:07.0",
+        "2021:03:04 25:06:07.0",
+        "2021:03:04 05:06:07",
+        "2021:03:04T05:06:07.0",
+        "\uff12\uff10\uff12\uff11:03:04 05:06:07.0",
+        "2021:03:04 05:06:0\u0667.0",
+    ],
+)
+def test_parse_exif_datetime_matches_strptime(value: str) -> None:
+    try:
+        expected = datetime.datetime.strptime(value, "%Y:%m:%d %H:%M:%S.%f")
+    except ValueError:
+        with pytest.raises(ValueError):
+            exif.parse_exif_datetime(value)
+    else:
+        assert exif.parse_exif_datetime(value) == expected
+
+
+class FakeTag:
+    def __init__(self, values: Any) -> None:
+        self.values = values
+
+
+@pytest.mark.parametrize(
+    "seconds", [Ratio(0, 1), Ratio(7, 1), Ratio(15, 2), Ratio(59123456, 1000000)]
+)
+def test_gps_capture_time(seconds: Ratio) -> None:
+    e = exif.EXIF(BytesIO(b"\xff\xd8" + b"\x00" * 100), lambda: (1, 1), name="a")
+    e.tags = {
+        "GPS GPSDate": FakeTag("2021:03:04"),
+        "GPS GPSTimeStamp": FakeTag([Ratio(5, 1), Ratio(6, 1), seconds]),
+    }
+    expected = datetime.datetime(2021, 3, 4, 5, 6) + datetime.timedelta(
+        seconds=seconds.num / seconds.den
+    )
+    epoch = datetime.datetime(1970, 1, 1)
+    assert e.extract_capture_time() == (expected - epoch).total_seconds()
+
+
+def image_with_xmp_attributes(attributes: bytes) -> BytesIO:
+    packet = (
+        b'<x:xmpmeta xmlns:x="adobe:ns:meta/">'
+        b'<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">'
+        b'<rdf:Description rdf:about="" drone-dji:Latitude="+46.1"'
+        b' drone-dji:Longitude="-7.2" ' + attributes + b"/>"
+        b"</rdf:RDF></x:xmpmeta>"
+    )
+    return BytesIO(b"\xff\xd8" + b"\x00" * 100 + packet)
+
+
+@pytest.mark.parametrize(
+    "attributes",
+    [
+        b'GPano:ProjectionType="equirectangular"',
+        b'Camera:Yaw="90"',
+        b'drone-dji:GimbalYawDegree="90" drone-dji:GimbalPitchDegree="-90"',
+        b'Camera:Yaw="90" Camera:Pitch="0" Camera:Roll="abc"',
+    ],
+)
+def test_extract_exif_without_ypr(attributes: bytes) -> None:
+    fileobj = image_with_xmp_attributes(attributes)
+    d = exif.EXIF(fileobj, lambda: (480, 640), name="a").extract_exif()
+    assert d["gps"] == {"latitude": 46.1, "longitude": -7.2}
+    assert "opk" not in d
+
+
+@pytest.mark.parametrize(
+    "attributes",
+    [
+        b'drone-dji:GimbalYawDegree="90" drone-dji:GimbalPitchDegree="-90"'
+        b' drone-dji:GimbalRollDegree="0"',
+        b'Camera:Yaw="90" Camera:Pitch="0" Camera:Roll="0"',
+    ],
+)
+def test_extract_exif_opk_from_ypr(attributes: bytes) -> None:
+    fileobj = image_with_xmp_attributes(attributes)
+    d = exif.EXIF(fileobj, lambda: (480, 640), name="a").extract_exif()
+    opk = d["opk"]
+    assert np.allclose([opk["omega"], opk["phi"], opk["kappa"]], [0, 0, -7.2])
@@ -1,5 +1,8 @@
 # pyre-strict
+import cv2
 import numpy as np
+import pytest
+from opensfm import pygeometry, transformations as tf, types
 from opensfm.synthetic_data import synthetic_metrics, synthetic_scene
 
 
@@ -34,3 +37,55 @@ def test_change_geo_reference(
         aligned_lla = aligned.reference.to_lla(*aligned_position)
         aligned_in_original = original.reference.to_topocentric(*aligned_lla)
         assert np.allclose(original_position, aligned_in_original, atol=0.01)
+
+
+def test_rotation_errors() -> None:
+    np.random.seed(42)
+    reference, candidate = types.Reconstruction(), types.Reconstruction()
+    for reconstruction in (reference, candidate):
+        camera = pygeometry.Camera.create_spherical()
+        camera.id = "camera"
+        reconstruction.add_camera(camera)
+
+    angles = [0.0, 1e-6, 0.5, 2.0, np.pi - 1e-6, np.pi]
+    expected = []
+    for i, angle in enumerate(angles):
+        R = tf.random_rotation_matrix()[:3, :3]
+        delta = tf.rotation_matrix(angle, np.random.normal(size=3))[:3, :3]
+        shot1 = reference.create_shot(str(i), "camera", pygeometry.Pose(R))
+        shot2 = candidate.create_shot(str(i), "camera", pygeometry.Pose(R.dot(delta)))
+        R1 = shot1.pose.get_rotation_matrix()
+        R2 = shot2.pose.get_rotation_matrix()
+        expected.append(np.linalg.norm(cv2.Rodrigues(R1.T.dot(R2))[0]))
+    reference.create_shot("reference_only", "camera", pygeometry.Pose())
+    candidate.create_shot("candidate_only", "camera", pygeometry.Pose())
+
+    errors = synthetic_metrics.rotation_errors(reference, candidate)
+    assert np.allclose(np.sort(errors), np.sort(expected), atol=1e-6)
+    assert np.allclose(np.sort(errors), angles, atol=1e-6)
+
+    assert synthetic_metrics.rotation_errors(
+        reference, types.Reconstruction()
+    ).shape == (0,)
+
+
+def test_find_alignment_matches_affine_fit() -> None:
+    np.random.seed(42)
+    for reflection in (1.0, -1.0):
+        v0 = np.random.normal(0, 10, (50, 3))
+        R = reflection * tf.random_rotation_matrix()[:3, :3]
+        v1 = 2.5 * v0.dot(R.T) + [1.0, -2.0, 3.0] + np.random.normal(0, 0.5, (50, 3))
+
+        s, A, b = synthetic_metrics.find_alignment(list(v0), list(v1))
+        M = tf.affine_matrix_from_points(v0.T, v1.T, shear=False)
+        assert np.isclose(np.linalg.det(A), 1.0)
+        assert np.allclose(s * A, M[:3, :3])
+        assert np.allclose(b, M[:3, 3])
+
+
+def test_find_alignment_requires_points() -> None:
+    points = [np.zeros(3), np.ones(3), None]
+    with pytest.raises(ValueError):
+        synthetic_metrics.find_alignment([], [])
+    with pytest.raises(ValueError):
+        synthetic_metrics.find_alignment(points, points[::-1])